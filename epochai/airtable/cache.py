@@ -0,0 +1,48 @@
+"""Persistent disk cache for Airtable table fetches.
+
+Fetching every table on each script invocation is rate-limit bound
+(Airtable allows 5 requests/second), so repeated runs spend most of their
+time re-downloading unchanged data. `cached_all` keeps the raw records of
+each table on disk and reuses them while they are younger than a TTL.
+"""
+import pickle
+import time
+from pathlib import Path
+
+from epochai.airtable.client import BASE_ID
+
+CACHE_DIR = Path.home() / ".cache" / "epochai"
+DEFAULT_TTL = 3600  # seconds
+
+
+def _cache_path(model_cls) -> Path:
+    table_name = model_cls.Meta["table_name"].replace("/", "_")
+    return CACHE_DIR / f"{BASE_ID}_{table_name}.pkl"
+
+
+def cached_all(model_cls, ttl: int = DEFAULT_TTL, use_cache: bool = True):
+    """Return ``model_cls.all(memoize=True)``, backed by an on-disk cache.
+
+    If a cache file for the table exists and is younger than ``ttl``
+    seconds, the records are deserialized from disk and no API call is
+    made. Otherwise the table is fetched from Airtable and the raw records
+    are written back to the cache. Pass ``use_cache=False`` to always hit
+    the API (and refresh the cache).
+    """
+    path = _cache_path(model_cls)
+    if use_cache and path.exists() and time.time() - path.stat().st_mtime < ttl:
+        try:
+            with path.open("rb") as f:
+                records = pickle.load(f)
+            # memoize=True registers the rebuilt instances with pyairtable's
+            # memo, so linked-record resolution stays in memory on warm runs
+            # instead of issuing one API request per link traversal
+            return [model_cls.from_record(record, memoize=True) for record in records]
+        except (OSError, pickle.PickleError, EOFError):
+            pass  # corrupt or unreadable cache; fall through to a fresh fetch
+
+    instances = model_cls.all(memoize=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        pickle.dump([instance.to_record() for instance in instances], f)
+    return instances
@@ -1,6 +1,15 @@
-from rich.console import Console
+import argparse
+import heapq
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+
+from rich.console import Console, Group
+from rich.rule import Rule
 from rich.table import Table
+from rich.text import Text
 
+from epochai.airtable.cache import cached_all
 from epochai.airtable.models import MLModel, Task, Score, Organization, BenchmarkRun
 
 console = Console()
@@ -19,8 +28,8 @@ COLORS = {
 }
 
 
-def print_model_info(model_id: str):
-    model = MLModel.first(formula=f"id='{model_id}'")
+def print_model_info(model_id: str, models_by_id: dict[str, MLModel], task_of_run: dict[str, Task]):
+    model = models_by_id.get(model_id)
     if not model:
         raise ValueError(f"Model {model_id} not found")
 
@@ -53,10 +62,12 @@ def print_model_info(model_id: str):
     if model.hf_developer:
         console.print(f"\n[{COLORS['DEVELOPER']}]Hugging Face Developer: {model.hf_developer}[/]")
 
-    # Print benchmark runs
+    # Print benchmark runs; accumulate the renderables and emit them in a
+    # single console call rather than one flush per run
+    renderables = []
     for run in model.benchmark_runs:
-        console.print(f"\n[bold {COLORS['TASK']}]Task: {run.task.path}[/]")
-        print(f"Log viewer: {run.log_viewer}")  # Using plain print for URLs
+        renderables.append(f"\n[bold {COLORS['TASK']}]Task: {task_of_run[run.id].path}[/]")
+        renderables.append(Text(f"Log viewer: {run.log_viewer}"))  # Plain text so URLs stay unstyled
 
         # Create a table just for scores
         table = Table(show_header=True, header_style="bold", title="Scores")
@@ -64,29 +75,28 @@ def print_model_info(model_id: str):
         table.add_column("Score", justify="right", style=COLORS['SCORE'])
         table.add_column("Std Error", justify="right", style=COLORS['ERROR'])
 
-        for score in run.scores:
-            table.add_row(
-                score.scorer,
-                f"{score.mean:.3f}",
-                f"±{score.stderr:.3f}"
-            )
+        # Precompute the formatted cells, then feed the table in a tight loop
+        rows = [(score.scorer, f"{score.mean:.3f}", f"±{score.stderr:.3f}") for score in run.scores]
+        for row in rows:
+            table.add_row(*row)
 
-        console.print(table)
-        print("─" * 80)  # Separator between runs
+        renderables.append(table)
+        renderables.append(Rule())  # Separator between runs
 
+    console.print(Group(*renderables))
 
-def print_high_scores(task_path: str, scorer: str, scores: list[Score]):
-    task = Task.first(formula=f"path='{task_path}'")
-    if not task:
+
+def print_high_scores(task_path: str, scorer: str,
+                      scores_by_task_scorer: dict[tuple[str, str], list[Score]],
+                      model_of_score: dict[str, MLModel],
+                      tasks_by_path: dict[str, Task]):
+    if task_path not in tasks_by_path:
         raise ValueError(f"Task {task_path} not found")
     # Get all scores for the task and scorer
-    task_scores = [
-        score for score in scores
-        if score.benchmark_run.task.path == task_path and score.scorer == scorer
-    ]
+    task_scores = scores_by_task_scorer.get((task_path, scorer), [])
 
-    # Sort by mean score in descending order and take top 10
-    top_scores = sorted(task_scores, key=lambda x: x.mean, reverse=True)[:10]
+    # Take the top 10 by mean score; nlargest is O(N log 10) vs O(N log N) for a full sort
+    top_scores = heapq.nlargest(10, task_scores, key=attrgetter('mean'))
 
     # Create a rich table for top scores
     table = Table(title=f"\nTop 10 Scores for {task_path} ({scorer})", show_header=True,
@@ -98,15 +108,15 @@ def print_high_scores(task_path: str, scorer: str, scores: list[Score]):
     table.add_column("Std Error", justify="right", style=COLORS['ERROR'])
 
     for score in top_scores:
-        run = score.benchmark_run
-        release_date = run.model.release_date
+        model = model_of_score[score.id]
+        release_date = model.release_date
         date_str = release_date.strftime("%Y-%m-%d") if release_date else "N/A"
-        if run.model.model_group.training_compute:
-            compute = f"{run.model.model_group.training_compute:.0e}"
+        if model.model_group.training_compute:
+            compute = f"{model.model_group.training_compute:.0e}"
         else:
             compute = "N/A"
         table.add_row(
-            run.model.model_id,
+            model.model_id,
             date_str,
             compute,
             f"{score.mean:.3f}",
@@ -116,51 +126,55 @@ def print_high_scores(task_path: str, scorer: str, scores: list[Score]):
     console.print(table)
 
 
-def print_performance_timeline(task_path: str, scorer: str, scores: list[Score], start_date=None,
-                             end_date=None):
+def print_performance_timeline(task_path: str, scorer: str,
+                             scores_by_task_scorer: dict[tuple[str, str], list[Score]],
+                             model_of_score: dict[str, MLModel],
+                             start_date=None, end_date=None):
     """Show how the best performance on a task evolved over time."""
     # Get all scores for the task and scorer
-    task_scores = [
-        score for score in scores
-        if score.benchmark_run.task.path == task_path
-           and score.scorer == scorer
-    ]
+    task_scores = scores_by_task_scorer.get((task_path, scorer), [])
 
     if not task_scores:
         console.print(f"[{COLORS['ERROR']}]No scores found for {task_path} with {scorer}[/]")
         return
 
-    # Count and filter models without release dates
-    scores_without_dates = [s for s in task_scores if not s.benchmark_run.model.release_date]
-    dated_scores = [s for s in task_scores if s.benchmark_run.model.release_date]
+    # Partition scores by release-date availability in a single pass
+    dated_scores, scores_without_dates = [], []
+    for s in task_scores:
+        model = model_of_score[s.id]
+        (dated_scores if model.release_date else scores_without_dates).append(s)
 
     if scores_without_dates:
         console.print(
             f"[{COLORS['ERROR']}]Warning: {len(scores_without_dates)} models were excluded due to missing release dates[/]")
         # Optionally show the excluded models
-        excluded_models = {s.benchmark_run.model.model_id for s in scores_without_dates}
+        excluded_models = {model_of_score[s.id].model_id for s in scores_without_dates}
         console.print(f"[{COLORS['ERROR']}]Excluded models: {', '.join(excluded_models)}[/]")
 
     if not dated_scores:
         console.print(f"[{COLORS['ERROR']}]No models with release dates found[/]")
         return
 
-    # Sort scores by release date
-    dated_scores = sorted(
-        dated_scores,
-        key=lambda x: x.benchmark_run.model.release_date
-    )
+    # Keep only the best score per release date; a full sort of all scores
+    # is unnecessary when only the unique dates need to be ordered
+    best_by_date = {}
+    for score in dated_scores:
+        date = model_of_score[score.id].release_date
+        current_best = best_by_date.get(date)
+        if current_best is None or score.mean > current_best.mean:
+            best_by_date[date] = score
 
-    # Rest of the function remains the same
+    # Walk the (few) unique dates in order and record each new best
     best_score = float('-inf')
     improvements = []
 
-    for score in dated_scores:
+    for date in sorted(best_by_date):
+        score = best_by_date[date]
         if score.mean > best_score:
             best_score = score.mean
             improvements.append({
-                'date': score.benchmark_run.model.release_date,
-                'model': score.benchmark_run.model.model_id,
+                'date': date,
+                'model': model_of_score[score.id],
                 'score': score.mean,
                 'stderr': score.stderr
             })
@@ -178,14 +192,14 @@ def print_performance_timeline(task_path: str, scorer: str, scores: list[Score],
     table.add_column("Std Error", justify="right", style=COLORS['ERROR'])
 
     for imp in improvements:
-        model = next((m for m in dated_scores if m.benchmark_run.model.model_id == imp['model']), None)
-        if model.benchmark_run.model.model_group.training_compute:
-            compute = f"{model.benchmark_run.model.model_group.training_compute:.0e}"
+        model = imp['model']
+        if model.model_group.training_compute:
+            compute = f"{model.model_group.training_compute:.0e}"
         else:
             compute = "N/A"
         table.add_row(
             imp['date'].strftime("%Y-%m-%d"),
-            imp['model'],
+            model.model_id,
             compute,
             f"{imp['score']:.3f}",
             f"±{imp['stderr']:.3f}"
@@ -195,23 +209,55 @@ def print_performance_timeline(task_path: str, scorer: str, scores: list[Score],
 
 
 def main():
-    # Get everything at the start to minimize API calls
-    scores = Score.all(memoize=True)
-    runs = BenchmarkRun.all(memoize=True)
-    models = MLModel.all(memoize=True)
-    tasks = Task.all(memoize=True)
-    organizations = Organization.all(memoize=True)
-
-    print_model_info(model_id="claude-3-5-sonnet-20240620")
+    parser = argparse.ArgumentParser(description='Print example reports from the benchmarks base.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the on-disk Airtable cache and fetch fresh data')
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
+    # Get everything at the start to minimize API calls. The five table
+    # fetches are independent, so overlap them instead of paginating each
+    # one sequentially
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(cached_all, table, use_cache=use_cache)
+            for table in (Score, BenchmarkRun, MLModel, Task, Organization)
+        ]
+        scores, runs, models, tasks, organizations = [f.result() for f in futures]
+
+    # Resolve every linked record exactly once up front; afterwards the
+    # reports only do dict lookups instead of per-attribute ORM traversals
+    model_of_run = {run.id: run.model for run in runs}
+    task_of_run = {run.id: run.task for run in runs}
+
+    # In-memory indexes over the already-fetched tables, so the reports
+    # never issue extra filtered .first() round-trips
+    models_by_id = {model.model_id: model for model in models}
+    tasks_by_path = {task.path: task for task in tasks}
+
+    # Index scores once by (task path, scorer) so each report is a single
+    # dict lookup instead of a full scan over all scores
+    scores_by_task_scorer = defaultdict(list)
+    model_of_score = {}
+    for score in scores:
+        run_id = score.benchmark_run.id
+        model_of_score[score.id] = model_of_run[run_id]
+        scores_by_task_scorer[(task_of_run[run_id].path, score.scorer)].append(score)
+
+    print_model_info(model_id="claude-3-5-sonnet-20240620", models_by_id=models_by_id,
+                     task_of_run=task_of_run)
     print_high_scores(
         task_path="bench.task.hendrycks_math.hendrycks_math_lvl_5",
         scorer="model_graded_equiv",
-        scores=scores
+        scores_by_task_scorer=scores_by_task_scorer,
+        model_of_score=model_of_score,
+        tasks_by_path=tasks_by_path
     )
     print_performance_timeline(
         task_path="bench.task.gpqa.gpqa_diamond",
         scorer="choice",
-        scores=scores
+        scores_by_task_scorer=scores_by_task_scorer,
+        model_of_score=model_of_score
     )
 
 
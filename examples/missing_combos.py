@@ -5,45 +5,57 @@ This script identifies which model-task combinations don't have benchmark runs,
 helping to identify gaps in benchmark coverage.
 """
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 import argparse
-from itertools import product
 import time
 
+from epochai.airtable.cache import cached_all
 from epochai.airtable.models import MLModel, Task, BenchmarkRun
 
 console = Console()
 
-def fetch_all_data():
+def fetch_all_data(use_cache=True):
     """
     Fetch all required data from Airtable in one place.
-    
+
     Returns:
-        Tuple of (runs, models, tasks, model_lookup, task_lookup)
+        Tuple of (runs, models, tasks, model_lookup, task_lookup, model_of_run, task_of_run)
     """
     console.print("[yellow]Fetching data from Airtable...[/]")
     start_time = time.time()
-    
-    # Fetch all data with a single API call per table
-    runs = BenchmarkRun.all(memoize=True)  # This will make a single API call
-    models = MLModel.all(memoize=True)     # This will make a single API call
-    tasks = Task.all(memoize=True)         # This will make a single API call
-    
+
+    # Fetch all data with at most a single API call per table; the three
+    # fetches are independent, so overlap them
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(cached_all, table, use_cache=use_cache)
+            for table in (BenchmarkRun, MLModel, Task)
+        ]
+        runs, models, tasks = [f.result() for f in futures]
+
     # Create lookups
     model_lookup = {model.model_id: model for model in models}
     task_lookup = {task.path: task for task in tasks}
-    
+
+    # Resolve each run's linked model and task exactly once; everything
+    # downstream uses these dicts instead of lazy linked-record traversal
+    model_of_run = {run.id: run.model for run in runs}
+    task_of_run = {run.id: run.task for run in runs}
+
     elapsed = time.time() - start_time
     console.print(f"[green]Data fetched in {elapsed:.2f} seconds.[/]")
-    
-    return runs, models, tasks, model_lookup, task_lookup
 
-def get_missing_combinations(runs, models, tasks):
+    return runs, models, tasks, model_lookup, task_lookup, model_of_run, task_of_run
+
+def get_missing_combinations(runs, tasks, model_of_run, task_of_run):
     """
     Find model-task combinations that don't have benchmark runs.
-    
+
     Only considers:
     - Models that appear in at least one successful benchmark run
     - Only benchmark runs with a status of "Success"
@@ -51,30 +63,31 @@ def get_missing_combinations(runs, models, tasks):
     # Filter runs with status "Success"
     successful_runs = [run for run in runs if run.status == "Success"]
     console.print(f"[green]Found {len(successful_runs)} successful benchmark runs out of {len(runs)} total runs.[/]")
-    
+
     # Create a set of (model_id, task_path) tuples for existing successful combinations
     existing_combinations = {
-        (run.model.model_id, run.task.path)
+        (model_of_run[(run_id := run.id)].model_id, task_of_run[run_id].path)
         for run in successful_runs
     }
-    
+
     # Get the set of models that appear in at least one successful benchmark run
-    active_models = {run.model.model_id for run in successful_runs}
+    active_models = {model_id for model_id, _ in existing_combinations}
     console.print(f"[blue]Found {len(active_models)} models with at least one successful benchmark run.[/]")
     
-    # Create a set of all possible combinations, but only with models that have
-    # been used successfully at least once
-    all_combinations = set(product(
-        active_models,
-        [task.path for task in tasks]
-    ))
-    
-    # Find missing combinations
-    missing_combinations = all_combinations - existing_combinations
-    
+    # Emit only the combinations that are actually missing, without first
+    # materializing the full model x task Cartesian product
+    task_paths = [task.path for task in tasks]
+    missing_combinations = {
+        (model_id, task_path)
+        for model_id in active_models
+        for task_path in task_paths
+        if (model_id, task_path) not in existing_combinations
+    }
+
     return missing_combinations
 
-def print_missing_combinations(missing_combinations, model_lookup, task_lookup, group_by=None, model_filter=None, task_filter=None):
+def print_missing_combinations(missing_combinations, model_lookup, task_lookup,
+                               group_by=None, model_filter=None, task_filter=None):
     """Print missing model-task combinations."""
     filtered_combinations = missing_combinations
     
@@ -97,65 +110,74 @@ def print_missing_combinations(missing_combinations, model_lookup, task_lookup,
     
     # Group the results if requested
     if group_by == "model":
-        # Group by model
-        grouped = defaultdict(list)
-        for model_id, task_path in filtered_combinations:
-            grouped[model_id].append(task_path)
-        
-        # Print grouped results
-        for model_id, task_paths in sorted(grouped.items()):
+        # One sort of the (model_id, task_path) pairs yields the groups in
+        # order with their task paths already sorted; no per-group sorting
+        sorted_pairs = sorted(filtered_combinations)
+
+        # Resolve organization names once per displayed model; only this
+        # output mode shows organizations, so only it pays for the links
+        orgs_for_model = {}
+        for model_id in {model_id for model_id, _ in sorted_pairs}:
             model = model_lookup.get(model_id)
-            model_name = model_id
-            
+            if model and model.model_group:
+                orgs_for_model[model_id] = [org.name for org in model.model_group.organizations]
+
+        # Collect the grouped results and print them with a single console call
+        renderables = []
+        for model_id, group in groupby(sorted_pairs, key=itemgetter(0)):
+            task_paths = [task_path for _, task_path in group]
             # Get organization info if available
-            org_info = ""
-            if model and model.model_group and model.model_group.organizations:
-                orgs = [org.name for org in model.model_group.organizations]
-                org_info = f" ({', '.join(orgs)})"
-            
-            console.print(f"\n[bold blue]Model: {model_name}{org_info}[/]")
-            
+            orgs = orgs_for_model.get(model_id)
+            org_info = f" ({', '.join(orgs)})" if orgs else ""
+
+            renderables.append(f"\n[bold blue]Model: {model_id}{org_info}[/]")
+
             # Create a table for missing tasks
             table = Table(show_header=True, header_style="bold")
             table.add_column("Missing Tasks", style="magenta")
-            
-            for task_path in sorted(task_paths):
+
+            for task_path in task_paths:
                 table.add_row(task_path)
-            
-            console.print(table)
-    
+
+            renderables.append(table)
+
+        console.print(Group(*renderables))
+
     elif group_by == "task":
-        # Group by task
-        grouped = defaultdict(list)
-        for model_id, task_path in filtered_combinations:
-            grouped[task_path].append(model_id)
-        
-        # Print grouped results
-        for task_path, model_ids in sorted(grouped.items()):
+        # Same single-sort approach, keyed by task path first
+        sorted_pairs = sorted(filtered_combinations, key=itemgetter(1, 0))
+
+        # Collect the grouped results and print them with a single console call
+        renderables = []
+        for task_path, group in groupby(sorted_pairs, key=itemgetter(1)):
+            model_ids = [model_id for model_id, _ in group]
             task = task_lookup.get(task_path)
             task_name = task.name if task and task.name else task_path
-            
-            console.print(f"\n[bold magenta]Task: {task_name} ({task_path})[/]")
-            
+
+            renderables.append(f"\n[bold magenta]Task: {task_name} ({task_path})[/]")
+
             # Create a table for missing models
             table = Table(show_header=True, header_style="bold")
             table.add_column("Missing Models", style="blue")
-            
-            for model_id in sorted(model_ids):
+
+            for model_id in model_ids:
                 table.add_row(model_id)
-            
-            console.print(table)
+
+            renderables.append(table)
+
+        console.print(Group(*renderables))
     
     else:
-        # No grouping, just show all missing combinations
-        table = Table(show_header=True, header_style="bold", title="Missing Model-Task Combinations")
-        table.add_column("Model", style="blue")
-        table.add_column("Task", style="magenta")
-        
-        for model_id, task_path in sorted(filtered_combinations):
-            table.add_row(model_id, task_path)
-        
-        console.print(table)
+        # No grouping, just show all missing combinations. This output can
+        # run to thousands of rows, so skip rich.Table (whose cell
+        # measurement pass is O(rows x cols)) and print pre-joined lines
+        # in a single console call
+        console.print("[bold]Missing Model-Task Combinations[/]")
+        lines = [
+            f"[blue]{model_id}[/]  [magenta]{task_path}[/]"
+            for model_id, task_path in sorted(filtered_combinations)
+        ]
+        console.print("\n".join(lines))
         console.print(f"Total missing combinations: {len(filtered_combinations)}")
 
 def print_summary(missing_combinations, model_lookup, task_lookup):
@@ -181,22 +203,18 @@ def print_summary(missing_combinations, model_lookup, task_lookup):
     console.print(f"Completion percentage: {completion_percentage:.2f}%")
     
     # Find top 5 models and tasks with most missing combinations
-    model_missing_count = defaultdict(int)
-    task_missing_count = defaultdict(int)
-    
-    for model_id, task_path in missing_combinations:
-        model_missing_count[model_id] += 1
-        task_missing_count[task_path] += 1
-    
+    model_missing_count = Counter(model_id for model_id, _ in missing_combinations)
+    task_missing_count = Counter(task_path for _, task_path in missing_combinations)
+
     # Print models with most missing combinations
     console.print("\n[bold blue]Top 5 Models with Most Missing Tasks[/]")
-    for model_id, count in sorted(model_missing_count.items(), key=lambda x: x[1], reverse=True)[:5]:
+    for model_id, count in model_missing_count.most_common(5):
         completion = ((total_tasks - count) / total_tasks) * 100
         console.print(f"{model_id}: Missing {count}/{total_tasks} tasks ({completion:.2f}% complete)")
-    
+
     # Print tasks with most missing combinations
     console.print("\n[bold magenta]Top 5 Tasks with Most Missing Models[/]")
-    for task_path, count in sorted(task_missing_count.items(), key=lambda x: x[1], reverse=True)[:5]:
+    for task_path, count in task_missing_count.most_common(5):
         completion = ((total_models - count) / total_models) * 100
         task = task_lookup.get(task_path)
         task_name = task.name if task and task.name else task_path
@@ -210,14 +228,18 @@ def main():
     parser.add_argument('--model-filter', help='Filter by model ID (case-insensitive substring match)')
     parser.add_argument('--task-filter', help='Filter by task path (case-insensitive substring match)')
     parser.add_argument('--summary', action='store_true', help='Show summary statistics')
-    
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the on-disk Airtable cache and fetch fresh data')
+
     args = parser.parse_args()
-    
+
     # Fetch all data at once to minimize API calls
-    runs, models, tasks, model_lookup, task_lookup = fetch_all_data()
-    
+    runs, models, tasks, model_lookup, task_lookup, model_of_run, task_of_run = fetch_all_data(
+        use_cache=not args.no_cache
+    )
+
     # Find missing combinations
-    missing_combinations = get_missing_combinations(runs, models, tasks)
+    missing_combinations = get_missing_combinations(runs, tasks, model_of_run, task_of_run)
     
     # Print summary if requested
     if args.summary:
@@ -225,9 +247,9 @@ def main():
     
     # Print missing combinations
     print_missing_combinations(
-        missing_combinations, 
-        model_lookup, 
-        task_lookup, 
+        missing_combinations,
+        model_lookup,
+        task_lookup,
         group_by=args.group_by,
         model_filter=args.model_filter,
         task_filter=args.task_filter
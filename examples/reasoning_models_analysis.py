@@ -1,9 +1,11 @@
+import argparse
 from rich.console import Console
 from rich.table import Table
-from datetime import datetime
 from collections import defaultdict
+from operator import attrgetter
 
-from epochai.airtable.models import MLModel, Score, Task
+from epochai.airtable.cache import cached_all
+from epochai.airtable.models import MLModel, Score, Task, BenchmarkRun
 
 console = Console()
 
@@ -19,38 +21,51 @@ COLORS = {
     "COMPUTE": "purple",
 }
 
-def get_reasoning_models():
+def get_reasoning_models(use_cache=True):
     """Fetch and return all reasoning-focused models (O1, O3, and Deepseek-R1)."""
-    models = MLModel.all(memoize=True)
+    models = cached_all(MLModel, use_cache=use_cache)
+    # Select reasoning models and drop -preview variants in a single pass
     reasoning_models = [
-        model for model in models 
-        if model.model_id.startswith(("o1-", "o3-")) or model.model_id == "DeepSeek-R1"
+        model for model in models
+        if (model_id := model.model_id).startswith(("o1-", "o3-")) or model_id == "DeepSeek-R1"
+        if "preview" not in model_id
     ]
-    # remove -preview models
-    reasoning_models = [
-        model for model in reasoning_models 
-        if not "preview" in model.model_id
-    ]
-    return sorted(reasoning_models, key=lambda x: x.release_date if x.release_date else datetime.min)
+    # Sort the dated models with a C-level attrgetter key; models without a
+    # release date sort first, as they did with the datetime.min fallback
+    undated = [m for m in reasoning_models if not m.release_date]
+    dated = sorted((m for m in reasoning_models if m.release_date), key=attrgetter('release_date'))
+    return undated + dated
 
-def print_model_comparison(models: list[MLModel], tasks: list[Task], task_scorers: dict[str, str]):
+def print_model_comparison(models: list[MLModel], tasks: list[Task], task_scorers: dict[str, str],
+                           use_cache=True):
     """
     Compare reasoning models across specific benchmark tasks.
-    
+
     Args:
         models: List of models to compare
         tasks: List of tasks to evaluate
         task_scorers: Dictionary mapping task paths to their appropriate scorers
+        use_cache: Whether to read table data from the on-disk cache
     """
-    scores = Score.all(memoize=True)
-    
+    scores = cached_all(Score, use_cache=use_cache)
+    runs = cached_all(BenchmarkRun, use_cache=use_cache)
+
+    # Resolve each run's linked model and task once; the score loop below
+    # then joins through these dicts instead of lazy linked-record traversal
+    model_of_run = {run.id: run.model for run in runs}
+    task_of_run = {run.id: run.task for run in runs}
+
     # Collect scores for each model and task
+    model_ids = frozenset(m.model_id for m in models)
+    valid_pairs = frozenset(task_scorers.items())
     model_scores = defaultdict(dict)
     for score in scores:
-        if score.benchmark_run.model.model_id in [m.model_id for m in models]:
-            task_path = score.benchmark_run.task.path
-            if task_path in task_scorers and score.scorer == task_scorers[task_path]:
-                model_scores[score.benchmark_run.model.model_id][task_path] = score
+        run_id = score.benchmark_run.id
+        model_id = model_of_run[run_id].model_id
+        if model_id in model_ids:
+            task_path = task_of_run[run_id].path
+            if (task_path, score.scorer) in valid_pairs:
+                model_scores[model_id][task_path] = score
 
     # Create comparison table
     table = Table(
@@ -61,25 +76,29 @@ def print_model_comparison(models: list[MLModel], tasks: list[Task], task_scorer
     
     table.add_column("Model ID", style=COLORS['MODEL'])
     table.add_column("Release Date", style=COLORS['DATE'])
-    
+
+    # Resolve each task's path and scorer once instead of per model below
+    task_paths = [task.path for task in tasks]
+    task_scorer_list = [task_scorers[task_path] for task_path in task_paths]
+
     # Add columns for each task
-    for task in tasks:
-        scorer = task_scorers[task.path]
-        table.add_column(f"{task.name or task.path}\n[dim]({scorer})[/]", style=COLORS['SCORE'])
-    
+    for task, task_path, scorer in zip(tasks, task_paths, task_scorer_list):
+        table.add_column(f"{task.name or task_path}\n[dim]({scorer})[/]", style=COLORS['SCORE'])
+
     # Add rows for each model
     for model in models:
         row = [model.model_id]
         row.append(model.release_date.strftime("%Y-%m-%d") if model.release_date else "N/A")
-        
+
         # Check if model has any scores before adding row
         has_scores = False
         scores_for_tasks = []
-        
+        scores_by_task = model_scores[model.model_id]
+
         # Add scores for each task
-        for task in tasks:
-            if task.path in model_scores[model.model_id]:
-                score = model_scores[model.model_id][task.path]
+        for task_path in task_paths:
+            score = scores_by_task.get(task_path)
+            if score:
                 scores_for_tasks.append(
                     f"{score.mean:.3f} [dim {COLORS['ERROR']}]±{score.stderr:.3f}[/]"
                 )
@@ -95,11 +114,17 @@ def print_model_comparison(models: list[MLModel], tasks: list[Task], task_scorer
     console.print(table)
 
 def main():
+    parser = argparse.ArgumentParser(description='Compare reasoning models across benchmark tasks.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the on-disk Airtable cache and fetch fresh data')
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
     # Get reasoning models
-    reasoning_models = get_reasoning_models()
-    
+    reasoning_models = get_reasoning_models(use_cache=use_cache)
+
     # Get Task objects for interesting tasks
-    tasks = Task.all(memoize=True)
+    tasks = cached_all(Task, use_cache=use_cache)
     interesting_tasks = [
         task for task in tasks
         if task.path in [
@@ -115,9 +140,10 @@ def main():
     }
     
     print_model_comparison(
-        reasoning_models, 
+        reasoning_models,
         interesting_tasks,
-        task_scorers=task_scorers
+        task_scorers=task_scorers,
+        use_cache=use_cache
     )
 
 if __name__ == "__main__":